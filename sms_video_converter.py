@@ -1,11 +1,22 @@
 import os
-import re
+import sys
 import time
 import json
 import shutil
+import argparse
+import functools
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from subprocess import Popen, PIPE
 
+try:
+    # Optional: probing through libmediainfo avoids one process spawn per file
+    from pymediainfo import MediaInfo
+except ImportError:
+    MediaInfo = None
+
 VERSION = '1.1.1'
 WELCOME_MSG = f'## Welcome to SMS Video Converter v{VERSION}! ##'
 VIDEO_EXTS = ('.mkv', '.mp4', '.avi', '.rmvb', '.rm', '.mov', '.flv', '.mpg', '.mpeg', '.wmv')
@@ -14,6 +25,10 @@ RESOLUTION_4BY3 = '640x480'
 RESOLUTION_16BY9 = '854x480'
 VIDEO_BITRATE_RANGE = [1000, 9000]
 AUDIO_BITRATE = '192k'
+MEDIAINFO_SKIP_EXTS = ('.rm', '.rmvb') # Formats libmediainfo doesn't reliably support
+CACHE_FILE = Path.home() / '.cache' / 'sms_video_converter' / 'probe.json'
+
+_probe_cache = None
 
 
 def _prompt_input(prompt, validate_func):
@@ -31,7 +46,7 @@ def _prompt_input(prompt, validate_func):
         str: The user input.
     """
     while True:
-        user_input = str(input(f'# {prompt}\n')).strip()
+        user_input = input(f'# {prompt}\n').strip()
         try:
             validated_input = validate_func(user_input)
             if validated_input:
@@ -54,9 +69,9 @@ def _prompt_yes_no(prompt, default=True):
         bool: yes(True) or no(False).
     """
     result = default
-    prompt += ' (Y/n)' if default else ' (y/N)'
+    full_prompt = prompt + (' (Y/n)' if default else ' (y/N)')
     while True:
-        user_input = str(input(f'# {prompt}\n'))
+        user_input = input(f'# {full_prompt}\n')
         if not user_input:
             break
         elif user_input.strip().lower() == 'y':
@@ -69,6 +84,36 @@ def _prompt_yes_no(prompt, default=True):
             print('# Invalid input!')
     return result
 
+def _prompt_int(prompt, min_value=None, max_value=None, default=None):
+    """
+    Interact with the user to collect a non-negative integer, optionally range-checked.
+
+    Args:
+        prompt (str): The message to be displayed to the user.
+        min_value (int, optional): Smallest accepted value. Defaults to None.
+        max_value (int, optional): Largest accepted value. Defaults to None.
+        default (int, optional): Returned when the user hits return without typing anything.
+            Defaults to None, which makes an answer mandatory.
+
+    Returns:
+        int: The validated integer.
+    """
+    def validate(user_input):
+        if not user_input and default is not None:
+            return True
+        if not user_input.isdigit():
+            return False
+        value = int(user_input)
+        if min_value is not None and value < min_value:
+            return False
+        if max_value is not None and value > max_value:
+            return False
+        return True
+    if default is not None:
+        prompt += f' (default: {default})'
+    user_input = _prompt_input(prompt, validate)
+    return default if not user_input else int(user_input)
+
 def _prompt_choice(prompt, options):
     """
     Interact with the user to choose from a list of options.
@@ -78,18 +123,14 @@ def _prompt_choice(prompt, options):
         options (list): The list of options.
 
     Returns:
-        int: The index of the chosen option.
+        The chosen option.
     """
+    options_text = ''.join(f'\n  {i + 1}. {option}' for i, option in enumerate(options))
     while True:
-        options_text = ''
-        for i, option in enumerate(options):
-            options_text += f'\n  {i + 1}. {option}'
-        user_input = str(input(f'# {prompt}{options_text} \n'))
-        try:
-            chosen_index = int(user_input.strip())
-            return options[chosen_index - 1]
-        except:
-            print('# Invalid input!')
+        user_input = input(f'# {prompt}{options_text} \n').strip()
+        if user_input.isdigit() and 1 <= int(user_input) <= len(options):
+            return options[int(user_input) - 1]
+        print('# Invalid input!')
 
 def get_options():
     """
@@ -101,27 +142,22 @@ def get_options():
         - audio_choice (int): Audio track index.
         - subtitle_choice (None, int, str): Subtitle burn in options, integer for using internal subtitle index, 'ext' for external subtitle file
         - overwrite_output (bool): Ovewrite output file if exists.
+        - max_jobs (int): Number of conversions to run in parallel.
     """
     # What's the target video bitrate?
-    validate_vbitrate = lambda x: VIDEO_BITRATE_RANGE[0] <= int(x) <= VIDEO_BITRATE_RANGE[1]
-    v_bitrate = _prompt_input(
+    v_bitrate = _prompt_int(
         'Set the video bitrate, numbers only: (1000-9000 kbps)',
-        validate_vbitrate
+        VIDEO_BITRATE_RANGE[0],
+        VIDEO_BITRATE_RANGE[1]
         )
     v_bitrate = f'{v_bitrate}k'
 
     # Should we crop the video to 4 by 3?
     should_crop = _prompt_yes_no('Crop the widescreen video to 4:3?', default=False)
-    
+
     # Choose audio track index
-    audio_choice = 0
-    audio_choice = int(
-        _prompt_input(
-            'Enter the index of audio track, the first track will be 0:',
-            lambda x:  x.isdigit()
-            )
-        )
-    
+    audio_choice = _prompt_int('Enter the index of audio track, the first track will be 0:')
+
     # Should we burn the subtitle to the video?
     should_burn_subtitle = _prompt_yes_no('Burn the text subtitles to the video?')
     if should_burn_subtitle:
@@ -130,104 +166,202 @@ def get_options():
             ('Internal', 'External')
             ) == 'External' else 'int'
         if subtitle_choice == 'int':
-            subtitle_choice = int(
-                _prompt_input(
-                    'Enter the index of subtitle track, the first track will be 0:',
-                    lambda x:  x.isdigit()
-                    )
-                )
+            subtitle_choice = _prompt_int('Enter the index of subtitle track, the first track will be 0:')
     else:
         subtitle_choice = None
 
     # Overwrite existing files in the output directory?
     overwrite_output = _prompt_yes_no('Overwrite existing files in the output directory?', default=False)
 
-    return v_bitrate, should_crop, audio_choice, subtitle_choice, overwrite_output
+    # How many conversions should run at once? More than one trades the live
+    # percentage display for one status line per finished file.
+    jobs_env = os.environ.get('SMS_JOBS')
+    default_jobs = int(jobs_env) if jobs_env else max(1, (os.cpu_count() or 2) // 2)
+    max_jobs = _prompt_int('How many conversions to run in parallel?', 1, default=default_jobs)
 
-def probe_source(source):
+    return v_bitrate, should_crop, audio_choice, subtitle_choice, overwrite_output, max_jobs
+
+def _load_cache():
     """
-    Probes a video file to extract resolution, audio and subtitle stream info.
+    Load the on-disk ffprobe cache, discarding it when missing, corrupt or written by another version.
+
+    Returns:
+        dict: The cache with a 'version' string and a 'probes' dictionary keyed by '{abs_path}:{mtime_ns}:{size}'.
+    """
+    global _probe_cache
+    try:
+        with open(CACHE_FILE) as cache_file:
+            cache = json.load(cache_file)
+        if cache.get('version') != VERSION:
+            cache = {'version': VERSION, 'probes': {}}
+    except (OSError, ValueError):
+        cache = {'version': VERSION, 'probes': {}}
+    _probe_cache = cache
+    return cache
+
+def _save_cache():
+    """
+    Write the ffprobe cache back to disk atomically via a temp file and os.replace.
+
+    Returns:
+        None
+    """
+    if _probe_cache is None:
+        return
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = str(CACHE_FILE) + '.tmp'
+        with open(temp_file, 'w') as cache_file:
+            json.dump(_probe_cache, cache_file)
+        os.replace(temp_file, CACHE_FILE)
+    except OSError:
+        pass # The cache is only an optimization, a failed write shouldn't stop the conversion
+
+def _ffprobe_streams(source):
+    """
+    Runs a single ffprobe call that returns every stream and the container duration of a video file.
 
     Args:
-        source (str): Filename of the source video.
+        source (str): Path of the source video.
+
+    Raises:
+        subprocess.CalledProcessError: When ffprobe exits non-zero.
 
     Returns:
         tuple:
-            - resolution (dict): A dictionary containing the 'width' and 'height' of the first video stream
-            - audios (list): A list of audio streams
-            - subtitles (list): A list of subtitle streams
+            - streams (list): The stream dictionaries from ffprobe's JSON output.
+            - duration (float or None): The container duration in seconds, None when not reported.
     """
-    # Probing the resolution
-    probe_resolution_cmd = [
-        'ffprobe', 
-        '-v',
-        'error',
-        '-select_streams',
-        'v:0',
-        '-show_entries',
-        'stream=width,height',
-        '-of',
-        'json',
-        source
-        ]
-    probe_proc = Popen(probe_resolution_cmd, stdout=PIPE)
-    resolution = json.loads(probe_proc.communicate()[0].decode("utf-8"))['streams'][0]
-    
-    # Probing audio tracks
-    probe_audio_cmd = [
-        'ffprobe',
-        '-v',
-        'error',
-        '-select_streams',
-        'a',
-        '-show_entries',
-        'stream=index',
-        '-of',
-        'json',
-        source
-        ]
-    probe_proc = Popen(probe_audio_cmd, stdout=PIPE)
-    audios = json.loads(probe_proc.communicate()[0].decode("utf-8"))['streams']
-    
-    # Probing subtitle streams
-    probe_subtitle_cmd = [
+    probe_cmd = [
         'ffprobe',
         '-v',
         'error',
-        '-select_streams',
-        's',
         '-show_entries',
-        'stream=index',
+        'stream=index,codec_type,width,height:format=duration',
         '-of',
         'json',
         source
         ]
-    probe_proc = Popen(probe_subtitle_cmd, stdout=PIPE)
-    subtitles = json.loads(probe_proc.communicate()[0].decode("utf-8"))['streams']
-    return resolution, audios, subtitles
+    probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
+    data = json.loads(probe_result.stdout)
+    duration = data.get('format', {}).get('duration')
+    return data['streams'], float(duration) if duration else None
+
+def _probe_with_mediainfo(source):
+    """
+    Probe a video file through libmediainfo, which parses container headers in-process and
+    amortizes its startup cost across all files, unlike one ffprobe spawn per file.
+
+    Args:
+        source (str): Path of the source video.
+
+    Returns:
+        tuple or None: The same (resolution, audios, subtitles, duration) shape as the ffprobe
+        path, or None when the file has no parsable video track.
+    """
+    media_info = MediaInfo.parse(source)
+    video_track = next((t for t in media_info.tracks if t.track_type == 'Video'), None)
+    if video_track is None or not video_track.width or not video_track.height:
+        return None
+    resolution = {'width': int(video_track.width), 'height': int(video_track.height)}
+    audios = [{'index': i} for i, t in enumerate(t for t in media_info.tracks if t.track_type == 'Audio')]
+    subtitles = [{'index': i} for i, t in enumerate(t for t in media_info.tracks if t.track_type == 'Text')]
+    general_track = next((t for t in media_info.tracks if t.track_type == 'General'), None)
+    duration = None
+    if general_track is not None and general_track.duration:
+        duration = float(general_track.duration) / 1000 # libmediainfo reports milliseconds
+    return resolution, audios, subtitles, duration
+
+def probe_source(source):
+    """
+    Probes a video file to extract resolution, audio and subtitle stream info.
+
+    Args:
+        source (str): Filename of the source video.
+
+    Returns:
+        tuple or None: None when the file can't be probed (the reason is printed), otherwise:
+            - resolution (dict): A dictionary containing the 'width' and 'height' of the first video stream
+            - audios (list): A list of audio streams
+            - subtitles (list): A list of subtitle streams
+            - duration (float or None): The container duration in seconds, None when not reported
+    """
+    # Check the cache first, the probe result only changes when the file does.
+    # Entries without a duration predate it being probed and count as misses.
+    stat = os.stat(source)
+    cache_key = f'{os.path.abspath(source)}:{stat.st_mtime_ns}:{stat.st_size}'
+    cache = _probe_cache if _probe_cache is not None else _load_cache()
+    cached = cache['probes'].get(cache_key)
+    if cached is not None and 'duration' in cached:
+        return cached['resolution'], cached['audios'], cached['subtitles'], cached['duration']
+
+    # Prefer libmediainfo when available, falling back to ffprobe for the
+    # formats it can't handle or whenever the parse comes up empty
+    if MediaInfo is not None and not source.lower().endswith(MEDIAINFO_SKIP_EXTS):
+        try:
+            probed = _probe_with_mediainfo(source)
+        except (OSError, RuntimeError, ValueError):
+            probed = None
+        if probed is not None:
+            resolution, audios, subtitles, duration = probed
+            cache['probes'][cache_key] = {
+                'resolution': resolution, 'audios': audios, 'subtitles': subtitles, 'duration': duration
+                }
+            return resolution, audios, subtitles, duration
+
+    # Probing resolution, audio and subtitle streams with a single ffprobe call
+    try:
+        streams, duration = _ffprobe_streams(source)
+        resolution = next(s for s in streams if s['codec_type'] == 'video')
+    except (subprocess.CalledProcessError, StopIteration, ValueError, KeyError):
+        print(f'\r# Skipping {os.path.basename(source)}, it couldn\'t be probed')
+        return None
+    audios = [s for s in streams if s['codec_type'] == 'audio']
+    subtitles = [s for s in streams if s['codec_type'] == 'subtitle']
+    cache['probes'][cache_key] = {
+        'resolution': resolution, 'audios': audios, 'subtitles': subtitles, 'duration': duration
+        }
+    return resolution, audios, subtitles, duration
     
-def has_external_subtitle(base_dir, source):
+def _index_external_subtitles(base_dir):
+    """
+    Builds a stem -> filename index of the subtitle files in a directory with a single scan.
+
+    Args:
+        base_dir (str): Path of the directory to index.
+
+    Returns:
+        dict: Mapping of subtitle filename without extension to the filename.
+    """
+    subtitle_index = {}
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(SUBTITLE_EXTS):
+                subtitle_index[os.path.splitext(entry.name)[0]] = entry.name
+    return subtitle_index
+
+def has_external_subtitle(subtitle_index, source):
     """
-    Checks if an external subtitle file exists in the given directory that matches the source video name.
+    Checks the indexed subtitle files of the source directory for one that matches the source video name.
 
     Args:
-        base_dir (str): Path to the directory to search for subtitle files.
+        subtitle_index (dict): Stem -> filename index of the subtitle files, from _index_external_subtitles.
         source (str): Filename of the source video.
 
     Returns:
         str or None: A subtitle command string for ffmpeg video filter (e.g., 'subtitles=example.srt') if a matching subtitle file is found;
         otherwise, returns None.
     """
-    subtitle_cmd = None
-    # Checking for external subtitle
-    for each_file in os.listdir(base_dir):
-        each_name, each_ext = os.path.splitext(each_file)
-        each_ext = each_ext.lower()
-        source_name = os.path.splitext(source)[0]
-        if (each_ext in SUBTITLE_EXTS) and (source_name in each_name):
-            subtitle_cmd = f'subtitles=\'{os.path.basename(each_file)}\''
-            break
-    return subtitle_cmd
+    source_name = os.path.splitext(source)[0]
+    # Fast path: subtitles are usually named exactly after the video
+    match = subtitle_index.get(source_name)
+    if match is None:
+        # Fall back to a scan for variants like 'video.en.srt'. Only stems extended
+        # with a '.tag' count, a substring match would wrongly pair 'The Lorax'
+        # with 'The Lorax 2' subtitles.
+        source_prefix = source_name + '.'
+        match = next((each_file for stem, each_file in subtitle_index.items() if stem.startswith(source_prefix)), None)
+    return f'subtitles=\'{match}\'' if match else None
 
 def has_internal_subtitle(source, subtitle_streams, subtitle_choice):
     """
@@ -250,6 +384,23 @@ def has_internal_subtitle(source, subtitle_streams, subtitle_choice):
         print(f'# Subtitle stream {subtitle_choice} not found')
     return subtitle_cmd
 
+@functools.lru_cache(maxsize=None)
+def _crop_cmd(width, height):
+    """
+    Generate the cropping command for ffmpeg video filter, memoized per unique resolution
+    since the files of a batch usually share one.
+
+    Args:
+        width (int): The width of the video.
+        height (int): The height of the video.
+
+    Returns:
+        str: A formatted crop command string for ffmpeg video filter (e.g. 'crop=1440:1080:240:0').
+    """
+    output_width = (height // 3) * 4
+    cropped_width = (width - output_width) // 2
+    return f'crop={output_width}:{height}:{cropped_width}:0'
+
 def calculate_cropping(resolution):
     """
     Calculate and generate the cropping command for ffmpeg video filter based on the given resolution.
@@ -260,62 +411,96 @@ def calculate_cropping(resolution):
     Returns:
         str: A formatted crop command string for ffmpeg video filter (e.g. 'crop=1440:1080:240:0').
     """
-    output_width = int((resolution['height'] / 3) * 4)
-    cropped_width = int((resolution['width'] - output_width) / 2)
-    return f'crop={output_width}:{resolution['height']}:{cropped_width}:0'
+    return _crop_cmd(int(resolution['width']), int(resolution['height']))
 
-def get_sources():
+def scan_sources(path):
     """
-    Prompts the user to enter the path to a video file or directory and gathers information about video files found.
+    Scans a video file or directory and gathers information about the video files found.
 
     The function:
-        - Accepts a path input from the user (file or directory).
-        - Validates the path and ensures it exists.
-        - Scans for video files.
-        - For each video file found, probes its resolution and subtitle streams.
+        - Scans the given path (file or directory) for video files.
+        - For each video file found, probes its resolution, audio and subtitle streams.
         - Calculates the cropping command based on the video resolution.
 
+    Args:
+        path (str): Path of the source video file or directory, must exist.
+
     Returns:
         tuple:
-            - base_dir (Path): The base directory containing the video files.
+            - base_dir (str): Absolute path of the directory containing the video files.
             - source_list (list): A list of dictionaries, each containing:
                 - 'video' (str): The video filename.
+                - 'name' (str): The video filename without extension.
+                - 'path' (str): Absolute path of the video file.
+                - 'mtime' (float): Modification time of the video file.
                 - 'ratio' (float): The aspect ratio (height / width).
                 - 'crop_cmd' (str): The crop command string.
                 - 'audios' (list): Audio stream info from ffprobe.
                 - 'subtitles' (list): Subtitle stream info from ffprobe.
+                - 'duration' (float or None): Duration in seconds.
+              Empty when no video was found in the given path.
+    """
+    print('\r# Scanning...', end='')
+    base_dir = os.path.abspath(path)
+    if os.path.isdir(base_dir):
+        with os.scandir(base_dir) as entries:
+            files_list = [entry.name for entry in entries if entry.is_file()]
+    else:
+        files_list = [os.path.basename(base_dir)]
+        base_dir = os.path.dirname(base_dir)
+
+    # Verify the given path has video files
+    video_files = [each_file for each_file in files_list if each_file.lower().endswith(VIDEO_EXTS)]
+
+    # Probe all videos concurrently, ffprobe is subprocess/IO-bound so
+    # threads are enough. Cap the workers to avoid spawning too many
+    # ffprobe processes at once.
+    source_list = []
+    if video_files:
+        with ThreadPoolExecutor(max_workers=min(8, len(video_files))) as executor:
+            futures = [
+                executor.submit(probe_source, os.path.join(base_dir, each_file))
+                for each_file in video_files
+                ]
+            for completed, _ in enumerate(as_completed(futures), start=1):
+                print(f'\r# Scanning... ({completed}/{len(video_files)})', end='')
+            # The futures list keeps submission order, so the results line up with video_files
+            probe_results = [future.result() for future in futures]
+        probed = [(f, result) for f, result in zip(video_files, probe_results) if result is not None]
+        # Batch-compute the crop commands in one pass over the probed resolutions
+        crop_cmds = [calculate_cropping(resolution) for _, (resolution, _, _, _) in probed]
+        for (each_file, (resolution, audios, subtitles, duration)), crop_cmd in zip(probed, crop_cmds):
+            video_name = os.path.basename(each_file)
+            video_path = os.path.join(base_dir, each_file)
+            source_list.append({
+                'video': video_name,
+                'name': os.path.splitext(video_name)[0],
+                'path': video_path,
+                'mtime': os.stat(video_path).st_mtime,
+                'ratio': resolution['height'] / resolution['width'],
+                'crop_cmd': crop_cmd,
+                'audios': audios,
+                'subtitles': subtitles,
+                'duration': duration
+                })
+        _save_cache()
+    print('\r# Scanning... Done')
+    return base_dir, source_list
+
+def get_sources():
     """
+    Prompts the user to enter the path to a video file or directory and scans it for videos,
+    re-prompting until a path with at least one video is given.
 
+    Returns:
+        tuple: The (base_dir, source_list) pair from scan_sources.
+    """
     while True:
-        base_dir = str(input('# Enter the path of the source video file or directory:\n'))
-        if not os.path.exists(base_dir):
+        path = input('# Enter the path of the source video file or directory:\n')
+        if not os.path.exists(path):
             print('# Path doesn\'t exist, try again.')
             continue
-        else:
-            print('\r# Scanning...', end='')
-            if os.path.isdir(base_dir):
-                files_list = os.listdir(base_dir)
-            else:
-                files_list = [base_dir]
-                base_dir = Path(base_dir).parent.absolute()
-        os.chdir(base_dir)
-
-        # Verify the given path has video files
-        source_list = []
-        subtitle_list = []
-        for each_file in files_list:
-            each_name, each_ext = os.path.splitext(each_file)
-            each_ext = each_ext.lower()
-            if each_ext in VIDEO_EXTS:
-                resolution, audios, subtitles = probe_source(each_file)
-                source_list.append({
-                    'video': os.path.basename(each_file),
-                    'ratio': resolution['height'] / resolution['width'],
-                    'crop_cmd': calculate_cropping(resolution),
-                    'audios': audios,
-                    'subtitles': subtitles
-                    })
-        print('\r# Scanning... Done')
+        base_dir, source_list = scan_sources(path)
         if not source_list:
             print('# No video found in the given path.')
         else:
@@ -353,7 +538,7 @@ def get_output_dir():
         
     return _prompt_input('Enter the path of the output directory:', validate_output_path)
 
-def convert(source, v_bitrate, crop, audio_stream, subtitle, resolution, output, progress_msg):
+def convert(source, v_bitrate, crop, audio_stream, subtitle, resolution, output, progress_msg, live_progress=True, workdir=None, duration=None):
     """
     Converts a video file using ffmpeg with optional cropping and subtitle burning.
 
@@ -366,13 +551,22 @@ def convert(source, v_bitrate, crop, audio_stream, subtitle, resolution, output,
         resolution (str): Output video resolution in format 'widthxheight' (e.g., '640x480').
         output (str): Path for the output video file.
         progress_msg (str): Messages that writes to the console to display progress
+        live_progress (bool, optional): Print the progress percentage while converting. Should be
+            disabled when multiple conversions run in parallel, interleaved '\\r' updates from
+            several jobs corrupt the terminal. Defaults to True.
+        workdir (str, optional): Working directory for the ffmpeg process, so the relative
+            filenames in the subtitles filter resolve against the source directory. Defaults to None.
+        duration (float, optional): Duration of the source in seconds, from probe_source. Without
+            it no progress percentage can be computed. Defaults to None.
 
     Returns:
         None
     """
     filters = [] # Videos filter command such as crop and subtitle
     convert_cmd = [
-        'ffmpeg', 
+        'ffmpeg',
+        '-threads',
+        '0', # Let ffmpeg pick the thread count for decode/encode
         '-i',
         source,
         '-vcodec',
@@ -398,73 +592,138 @@ def convert(source, v_bitrate, crop, audio_stream, subtitle, resolution, output,
         filters.append(subtitle)
     if filters:
         vf_command = ','.join(filters)
-        convert_cmd += ['-vf', vf_command]
-    convert_cmd.append(output)
-    
-    ffmpeg_process = Popen(convert_cmd, stderr=PIPE)
-    
-    # Read progress
-    duration = None
-    time_pattern = re.compile(r'time=(\d+:\d+:\d+\.\d+)')
-    ftr = [3600, 60, 1] # Convert time to second https://stackoverflow.com/a/12739542
-    buffer = b''
-    all_stderr = ''
-    while True:
-        # Reading from stderr
-        chunk = ffmpeg_process.stderr.read(1)
-        if not chunk:
-            break # EOF
-        buffer += chunk
-        
-        if chunk == b'\r':  # FFmpeg progress lines end with \r
-            try:
-                line = buffer.decode("utf-8", errors="ignore").strip()
-                buffer = b""  # Reset for next line
-                all_stderr += line + '\n'
-
-                if 'Duration' in line and duration is None:
-                    duration_match = re.search(r'Duration: (\d+:\d+:\d+\.\d+)', line)
-                    if duration_match:
-                        duration = duration_match.group(1).split('.')[0]
-                        # Convert duration to seconds
-                        duration = sum([a * b for a, b in zip(ftr, map(int, duration.split(':')))])
-                
-                time_match = time_pattern.search(line)
-                if time_match:
-                    current_time = time_match.group(1).split('.')[0]
-                    # Convert current progress time to seconds
-                    current_time = sum([a * b for a, b in zip(ftr, map(int, current_time.split(':')))])
-                    progress_percentage = int(current_time / duration * 100)
-                    print(f'{progress_msg} {progress_percentage}%', end='')
-            except:
-                pass
-    
-    ffmpeg_process.wait()
-    if ffmpeg_process.returncode != 0:
+        convert_cmd += ['-filter_threads', '0', '-vf', vf_command]
+    # Encode to a temp name and move it into place on success, so an interrupted
+    # run never leaves a half-written file at the final path
+    part_output = output + '.part'
+    # Structured key=value progress on stdout instead of scraping the human-readable stats
+    convert_cmd += ['-nostats', '-progress', 'pipe:1', '-y', '-f', 'avi', part_output]
+
+    ffmpeg_process = Popen(convert_cmd, stdout=PIPE, stderr=PIPE, cwd=workdir)
+
+    # Drain stderr on the side so a chatty encode can't fill the pipe and deadlock,
+    # it's only read back when the conversion fails
+    stderr_parts = []
+    stderr_thread = threading.Thread(target=lambda: stderr_parts.append(ffmpeg_process.stderr.read()))
+    stderr_thread.start()
+
+    # Read progress, one '\n'-terminated key=value pair per line
+    duration_us = int(duration * 1_000_000) if duration else None
+    last_percentage = -1
+    last_write = 0.0
+    for raw_line in ffmpeg_process.stdout:
+        key, _, value = raw_line.strip().partition(b'=')
+        # out_time_us is the elapsed output time in microseconds
+        if key == b'out_time_us' and live_progress and duration_us and value.isdigit():
+            progress_percentage = int(value) * 100 // duration_us
+            now = time.monotonic()
+            # Only redraw when the percentage moved, at most once a second,
+            # terminal writes are surprisingly expensive
+            if progress_percentage != last_percentage and now - last_write >= 1.0:
+                sys.stdout.write(f'{progress_msg} {progress_percentage:3d}%')
+                sys.stdout.flush()
+                last_percentage = progress_percentage
+                last_write = now
+
+    stderr_thread.join()
+    # Both pipes have hit EOF by now, so ffmpeg is finished and this wait only reaps it
+    returncode = ffmpeg_process.wait()
+    if returncode != 0:
         print(f'{progress_msg} Failed')
-        raise Exception(all_stderr)
+        raise Exception(b''.join(stderr_parts).decode('utf-8', errors='ignore'))
+    os.replace(part_output, output)
     
     
+def _parse_args():
+    """
+    Parse the command line arguments for the non-interactive mode.
+
+    Returns:
+        argparse.Namespace: The parsed arguments, args.input is None when no source was given.
+    """
+    parser = argparse.ArgumentParser(
+        description='Convert videos into the DivX/AVI format that PS2 Simple Media System plays. '
+                    'Run without arguments for the interactive mode.'
+        )
+    parser.add_argument('--input', help='source video file or directory')
+    parser.add_argument('--output', help='output directory, created if missing')
+    parser.add_argument('--bitrate', type=int, default=2500, help='video bitrate in kbps (1000-9000, default: 2500)')
+    parser.add_argument('--crop', action='store_true', help='crop widescreen videos to 4:3')
+    parser.add_argument('--audio', type=int, default=0, help='audio track index (default: 0)')
+    parser.add_argument('--burn-subs', metavar='ext|INDEX',
+                        help="burn subtitles, 'ext' for external files or an internal stream index")
+    parser.add_argument('--overwrite', action='store_true', help='overwrite existing files in the output directory')
+    parser.add_argument('--jobs', type=int, metavar='N',
+                        help='number of parallel conversions (default: SMS_JOBS or half the CPU count)')
+    args = parser.parse_args()
+    if args.input:
+        if not args.output:
+            parser.error('--output is required when --input is given')
+        if not VIDEO_BITRATE_RANGE[0] <= args.bitrate <= VIDEO_BITRATE_RANGE[1]:
+            parser.error(f'--bitrate must be within {VIDEO_BITRATE_RANGE[0]}-{VIDEO_BITRATE_RANGE[1]}')
+        if args.burn_subs is not None and args.burn_subs != 'ext' and not args.burn_subs.isdigit():
+            parser.error("--burn-subs expects 'ext' or a subtitle stream index")
+        if args.jobs is not None and args.jobs < 1:
+            parser.error('--jobs must be at least 1')
+    return args
+
 def main():
+    args = _parse_args()
     print(WELCOME_MSG)
-    base_dir, source_list = get_sources()
-    output_dir = get_output_dir()
-    v_bitrate, should_crop, audio_choice, subtitle_choice, overwrite_output = get_options()
-    print(audio_choice)
+    if args.input:
+        # Non-interactive mode, everything comes from the command line
+        if not os.path.exists(args.input):
+            raise SystemExit(f'# Path doesn\'t exist: {args.input}')
+        base_dir, source_list = scan_sources(args.input)
+        if not source_list:
+            raise SystemExit('# No video found in the given path.')
+        output_dir = args.output
+        os.makedirs(output_dir, exist_ok=True)
+        v_bitrate = f'{args.bitrate}k'
+        should_crop = args.crop
+        audio_choice = args.audio
+        subtitle_choice = None
+        if args.burn_subs is not None:
+            subtitle_choice = 'ext' if args.burn_subs == 'ext' else int(args.burn_subs)
+        overwrite_output = args.overwrite
+        if args.jobs:
+            max_jobs = args.jobs
+        else:
+            jobs_env = os.environ.get('SMS_JOBS')
+            max_jobs = int(jobs_env) if jobs_env else max(1, (os.cpu_count() or 2) // 2)
+    else:
+        base_dir, source_list = get_sources()
+        output_dir = get_output_dir()
+        v_bitrate, should_crop, audio_choice, subtitle_choice, overwrite_output, max_jobs = get_options()
+    # Resolve once, the conversions run with the source directory as their cwd
+    output_dir = os.path.abspath(output_dir)
+
+    # Index the external subtitles once instead of re-walking the directory per video
+    subtitle_index = _index_external_subtitles(base_dir) if subtitle_choice == 'ext' else {}
 
-    count = 1
     count_padding = len(str(len(source_list)))
-    for each_source in source_list:
+    max_workers = max(1, min(max_jobs, len(source_list)))
+    live_progress = max_workers == 1
+
+    def convert_source(count, each_source):
+        """
+        Prepare and run the conversion of a single source. Returns the status line to print.
+        """
         progress_msg = f"\r {str(count).rjust(count_padding, ' ')}/{len(source_list)}: Converting {each_source['video']}..."
-        print(progress_msg, end="")
-        
-        output = os.path.join(output_dir, f'{os.path.splitext(each_source['video'])[0]}.avi')
-        if os.path.exists(output):
+        if live_progress:
+            print(progress_msg, end="")
+
+        output = os.path.join(output_dir, each_source['name'] + '.avi')
+        try:
+            output_stat = os.stat(output)
+        except FileNotFoundError:
+            output_stat = None
+        if output_stat is not None:
             if not overwrite_output:
-                print(f'{progress_msg} Skipped, file already existed!')
-                continue
-            else:
-                os.remove(output)
+                return f'{progress_msg} Skipped, file already existed!'
+            if output_stat.st_mtime >= each_source['mtime']:
+                # The existing output is newer than the source, re-encoding would produce the same file
+                return f'{progress_msg} Skipped, output is up to date!'
 
         crop = None
         resolution = RESOLUTION_16BY9
@@ -477,13 +736,12 @@ def main():
             each_source['audios'][audio_choice]
             audio = audio_choice
         except:
-            print(f'{progress_msg} Skipped, audio stream {audio_choice} doesn\'t exist!')
-            continue
+            return f'{progress_msg} Skipped, audio stream {audio_choice} doesn\'t exist!'
 
         subtitle = None
         if subtitle_choice is not None:
             if subtitle_choice == 'ext':
-                ext_sub_cmd = has_external_subtitle(base_dir, each_source['video'])
+                ext_sub_cmd = has_external_subtitle(subtitle_index, each_source['video'])
                 if ext_sub_cmd:
                     subtitle = ext_sub_cmd
             else:
@@ -491,9 +749,23 @@ def main():
                 if int_sub_cmd:
                     subtitle = int_sub_cmd
 
-        convert(each_source['video'], v_bitrate, crop, audio, subtitle, resolution, output, progress_msg)
-        print(f'{progress_msg} Completed')
-        count += 1
+        convert(each_source['path'], v_bitrate, crop, audio, subtitle, resolution, output, progress_msg, live_progress,
+                workdir=base_dir, duration=each_source['duration'])
+        return f'{progress_msg} Completed'
+
+    if max_workers == 1:
+        for count, each_source in enumerate(source_list, start=1):
+            print(convert_source(count, each_source))
+    else:
+        # Run several conversions at once, each finished job prints its own line
+        print(f'# Converting {len(source_list)} files with {max_workers} parallel jobs')
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(convert_source, count, each_source)
+                for count, each_source in enumerate(source_list, start=1)
+                ]
+            for future in as_completed(futures):
+                print(future.result())
 
 if __name__ == '__main__':
     main()
\ No newline at end of file